@@ -0,0 +1,142 @@
+# benchmarks/startup.py - Mede o tempo de inicialização até o primeiro prompt do menu
+# Uso (a partir da raiz do projeto):
+#   python benchmarks/startup.py                         # compara com a baseline salva
+#   python benchmarks/startup.py --limite 1.3 --execucoes 10
+#   python benchmarks/startup.py --atualizar-baseline    # grava a mediana medida como baseline
+# Sai com código 1 se a mediana passar de baseline * limite (mais uma pequena folga)
+# ou se algum módulo pesado for importado antes do primeiro prompt.
+# A baseline depende da máquina: regrave-a na máquina de referência.
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Raiz do projeto (pasta que contém main.py)
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Texto do prompt do menu principal (ver main.py)
+PROMPT = b"Escolha uma op"
+
+# Módulos que só devem ser carregados quando o usuário escolhe uma opção do menu
+MODULOS_TARDIOS = ["models.produto", "models.caixa", "models.carrinho", "models.pagamento",
+                   "json", "csv", "datetime"]
+
+# Mediana de referência do tempo até o primeiro prompt (gravada com --atualizar-baseline)
+ARQUIVO_BASELINE = os.path.join(RAIZ, "benchmarks", "startup_baseline.json")
+
+# Fator máximo aceito sobre a baseline antes de acusar regressão
+LIMITE_PADRAO = 1.5
+
+# Folga absoluta (ms) para o ruído de criar um processo novo a cada medição
+FOLGA_MS = 5.0
+
+# Rodadas extras de medição antes de acusar regressão: ruído some ao remedir,
+# uma regressão de verdade continua acima do limite
+RODADAS_EXTRAS = 2
+
+
+# Executa main.py e mede o tempo (em ms) até o prompt do menu aparecer na saída
+def tempo_ate_prompt() -> float:
+    inicio = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "main.py"],
+        cwd=RAIZ,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    saida = b""
+    try:
+        # input() descarrega o stdout ao exibir o prompt, então basta ler até encontrá-lo
+        while PROMPT not in saida:
+            pedaco = os.read(proc.stdout.fileno(), 4096)
+            if not pedaco:
+                raise RuntimeError("main.py encerrou antes de exibir o menu.")
+            saida += pedaco
+        decorrido = (time.perf_counter() - inicio) * 1000
+        # Escolhe "Fechar programa" para encerrar normalmente
+        proc.communicate(b"3\n", timeout=10)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+    return decorrido
+
+
+# Roda "python -X importtime -c 'import main'" e devolve {módulo: tempo cumulativo em us}
+def tempos_de_importacao() -> dict[str, int]:
+    resultado = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=RAIZ,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    tempos = {}
+    for linha in resultado.stderr.splitlines():
+        # Formato: "import time: self [us] | cumulative | imported package"
+        if not linha.startswith("import time:") or "imported package" in linha:
+            continue
+        _, cumulativo, nome = linha[len("import time:"):].split("|")
+        tempos[nome.strip()] = int(cumulativo)
+    return tempos
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de inicialização do sistema do mercado.")
+    parser.add_argument("--execucoes", type=int, default=5, help="quantidade de execuções medidas")
+    parser.add_argument("--limite", type=float, default=LIMITE_PADRAO,
+                        help=f"fator máximo aceito sobre a baseline (padrão: {LIMITE_PADRAO})")
+    parser.add_argument("--atualizar-baseline", action="store_true",
+                        help="grava a mediana medida como nova baseline em vez de comparar")
+    args = parser.parse_args(argv)
+
+    falhou = False
+
+    # 1. Importações feitas só por "import main"
+    tempos = tempos_de_importacao()
+    print("===== IMPORTAÇÕES (import main) =====")
+    for nome, us in sorted(tempos.items(), key=lambda t: t[1], reverse=True)[:10]:
+        print(f"  {us / 1000:8.2f} ms  {nome}")
+    carregados = [m for m in MODULOS_TARDIOS if m in tempos]
+    if carregados:
+        print(f"REGRESSÃO: módulos carregados antes do menu: {', '.join(carregados)}")
+        falhou = True
+
+    # 2. Tempo de parede até o primeiro prompt
+    amostras = [tempo_ate_prompt() for _ in range(args.execucoes)]
+    mediana = statistics.median(amostras)
+    print("===== TEMPO ATÉ O PRIMEIRO PROMPT =====")
+    print(f"Mediana: {mediana:.1f} ms (mín {min(amostras):.1f} / máx {max(amostras):.1f}, {len(amostras)} execuções)")
+
+    if args.atualizar_baseline:
+        with open(ARQUIVO_BASELINE, "w", encoding="utf-8") as f:
+            json.dump({"mediana_ms": round(mediana, 2)}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline gravada em {ARQUIVO_BASELINE}")
+        return 1 if falhou else 0
+
+    if not os.path.exists(ARQUIVO_BASELINE):
+        print("Sem baseline salva. Rode com --atualizar-baseline.")
+        return 1
+    with open(ARQUIVO_BASELINE, encoding="utf-8") as f:
+        baseline = json.load(f)["mediana_ms"]
+    limite_ms = baseline * args.limite + FOLGA_MS
+    for _ in range(RODADAS_EXTRAS):
+        if mediana <= limite_ms:
+            break
+        mediana = min(mediana, statistics.median(tempo_ate_prompt() for _ in range(args.execucoes)))
+        print(f"Remedição: mediana {mediana:.1f} ms")
+    print(f"Limite: {limite_ms:.1f} ms (baseline {baseline:.1f} ms x {args.limite} + {FOLGA_MS:.0f} ms)")
+    if mediana > limite_ms:
+        print("REGRESSÃO: inicialização acima do limite.")
+        falhou = True
+
+    return 1 if falhou else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,25 @@
+# consolidar.py - Sincronização noturna das lojas com a base central
+# Uso: python consolidar.py --central central lojas/loja_centro lojas/loja_bairro
+# Cada argumento é a pasta de instalação de uma loja (a que contém data/).
+import argparse
+from controllers.consolidacao import Consolidacao
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Consolida vendas e catálogos de várias lojas.")
+    parser.add_argument("lojas", nargs="+", help="pastas de instalação das lojas")
+    parser.add_argument("--central", default="central", help="pasta da base central (padrão: central)")
+    args = parser.parse_args(argv)
+
+    resumo = Consolidacao(args.central).sincronizar(args.lojas)
+
+    print("===== CONSOLIDAÇÃO =====")
+    print(f"Vendas novas transferidas: {resumo['vendas_novas']}")
+    print(f"Vendas duplicadas descartadas: {resumo['duplicadas']}")
+    catalogos = ", ".join(resumo["catalogos_atualizados"]) or "nenhum"
+    print(f"Catálogos atualizados: {catalogos}")
+
+
+# Garante que a consolidação só rode quando este arquivo for executado diretamente
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+# controllers/consolidacao.py - Consolida vendas e catálogos de várias lojas em uma base central
+# Cada loja é uma pasta de instalação (com data/vendas.jsonl, data/vendas.json e data/produtos.json).
+# A base central guarda:
+#   vendas.jsonl     - vendas de todas as lojas, uma por linha (campo "loja" identifica a origem)
+#   vendas_ids.db    - índice SQLite (id -> posição em vendas.jsonl) para deduplicar entre execuções
+#   produtos.json    - catálogo de todas as lojas (campo "loja" em cada produto)
+#   checkpoint.json  - até onde cada diário de loja já foi transferido
+# Só os registros novos desde o último checkpoint são lidos e cada ID novo é consultado
+# no índice em disco, então o custo de cada sincronização noturna é proporcional ao
+# volume novo, não ao histórico inteiro.
+import hashlib
+import heapq
+import json
+import os
+import sqlite3
+from utils.logging_simple import log
+
+ARQUIVO_VENDAS_CENTRAL = "vendas.jsonl"
+ARQUIVO_IDS_CENTRAL = "vendas_ids.db"
+ARQUIVO_PRODUTOS_CENTRAL = "produtos.json"
+ARQUIVO_CHECKPOINT = "checkpoint.json"
+
+
+# Gera um ID estável para vendas antigas (gravadas antes de as vendas terem "id")
+def _id_legado(loja: str, venda: dict) -> str:
+    chave = "|".join(str(venda.get(c)) for c in ("data_hora", "total", "itens", "forma", "cupom"))
+    return "legado-" + hashlib.sha1(f"{loja}|{chave}".encode("utf-8")).hexdigest()[:20]
+
+
+# Posição logo após a última linha completa (terminada em "\n") do arquivo, lendo de trás para frente
+def _fim_ultima_linha(caminho: str, bloco: int = 65536) -> int:
+    with open(caminho, "rb") as f:
+        fim = f.seek(0, os.SEEK_END)
+        while fim > 0:
+            inicio = max(0, fim - bloco)
+            f.seek(inicio)
+            pedaco = f.read(fim - inicio)
+            quebra = pedaco.rfind(b"\n")
+            if quebra != -1:
+                return inicio + quebra + 1
+            fim = inicio
+    return 0
+
+
+# Grava JSON com nome temporário e renomeia, para nunca deixar um arquivo pela metade
+def _salvar_json_atomico(caminho: str, dados, indent=None):
+    temporario = caminho + ".tmp"
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(dados, f, ensure_ascii=False, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporario, caminho)
+
+
+class DiarioLoja:
+    # Construtor: representa o diário de vendas de uma loja a partir de um offset (em bytes)
+    def __init__(self, pasta_loja: str, estado: dict):
+        self.pasta = pasta_loja
+        self.nome = os.path.basename(os.path.normpath(pasta_loja))
+        self.arquivo_journal = os.path.join(pasta_loja, "data", "vendas.jsonl")
+        self.arquivo_vendas = os.path.join(pasta_loja, "data", "vendas.json")
+        self.arquivo_produtos = os.path.join(pasta_loja, "data", "produtos.json")
+        self.offset = int(estado.get("offset", 0))
+        # inode do diário lido por último; se mudar, o arquivo foi substituído/rotacionado
+        self.inode = estado.get("inode")
+        self.legado_importado = bool(estado.get("legado_importado", False))
+        self.assinatura_catalogo = estado.get("catalogo")
+
+    # Vendas antigas do vendas.json sem "id" (só na primeira sincronização da loja)
+    def _vendas_legado(self):
+        if self.legado_importado or not os.path.exists(self.arquivo_vendas):
+            return
+        try:
+            with open(self.arquivo_vendas, "r", encoding="utf-8") as f:
+                vendas = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            log(f"ERRO ao ler vendas antigas da loja {self.nome}: {e}")
+            return
+        antigas = [v for v in vendas if "id" not in v]
+        for venda in sorted(antigas, key=lambda v: v["data_hora"]):
+            yield dict(venda, id=_id_legado(self.nome, venda), loja=self.nome)
+        self.legado_importado = True
+
+    # Vendas novas do diário, a partir do offset salvo no checkpoint.
+    # Uma linha sem "\n" no final (venda sendo gravada agora) fica para a próxima sincronização.
+    def _vendas_journal(self):
+        if not os.path.exists(self.arquivo_journal):
+            return
+        with open(self.arquivo_journal, "rb") as f:
+            info = os.fstat(f.fileno())
+            substituido = self.inode is not None and info.st_ino != self.inode
+            if substituido or info.st_size < self.offset:
+                # Relê desde o início; o que já foi consolidado é descartado pela deduplicação por ID
+                log(f"Consolidação: diário da loja {self.nome} foi substituído ou rotacionado; relendo desde o início")
+                self.offset = 0
+            self.inode = info.st_ino
+            f.seek(self.offset)
+            for linha in f:
+                if not linha.endswith(b"\n"):
+                    break
+                self.offset += len(linha)
+                if not linha.strip():
+                    continue
+                venda = json.loads(linha)
+                venda["loja"] = self.nome
+                yield venda
+
+    # Todas as vendas novas da loja, em ordem de data_hora
+    def vendas_novas(self):
+        yield from self._vendas_legado()
+        yield from self._vendas_journal()
+
+    # Assinatura (mtime, tamanho) do catálogo, usada para saber se ele mudou
+    def assinatura_catalogo_atual(self):
+        if not os.path.exists(self.arquivo_produtos):
+            return None
+        info = os.stat(self.arquivo_produtos)
+        return [info.st_mtime_ns, info.st_size]
+
+    # Estado a ser salvo no checkpoint
+    def estado(self) -> dict:
+        return {
+            "offset": self.offset,
+            "inode": self.inode,
+            "legado_importado": self.legado_importado,
+            "catalogo": self.assinatura_catalogo,
+        }
+
+
+class Consolidacao:
+    # Construtor: define a pasta da base central
+    def __init__(self, pasta_central: str = "central"):
+        self.pasta_central = pasta_central
+        self.arquivo_vendas = os.path.join(pasta_central, ARQUIVO_VENDAS_CENTRAL)
+        self.arquivo_ids = os.path.join(pasta_central, ARQUIVO_IDS_CENTRAL)
+        self.arquivo_produtos = os.path.join(pasta_central, ARQUIVO_PRODUTOS_CENTRAL)
+        self.arquivo_checkpoint = os.path.join(pasta_central, ARQUIVO_CHECKPOINT)
+
+    # Carrega o checkpoint. Sem checkpoint, o tamanho confirmado de vendas.jsonl é o das
+    # linhas completas que já estão lá: vendas consolidadas nunca são descartadas, e as lojas
+    # são relidas desde o início (o índice de IDs descarta o que já foi transferido).
+    def carregar_checkpoint(self) -> dict:
+        if os.path.exists(self.arquivo_checkpoint):
+            with open(self.arquivo_checkpoint, "r", encoding="utf-8") as f:
+                return json.load(f)
+        tamanho = 0
+        if os.path.exists(self.arquivo_vendas):
+            tamanho = _fim_ultima_linha(self.arquivo_vendas)
+            log(f"Consolidação: checkpoint ausente; mantendo {self.arquivo_vendas} e relendo as lojas desde o início")
+        return {"tamanho_vendas": tamanho, "lojas": {}}
+
+    # Abre o índice de IDs (criando a tabela na primeira vez)
+    def _abrir_indice(self) -> sqlite3.Connection:
+        conexao = sqlite3.connect(self.arquivo_ids)
+        conexao.execute("CREATE TABLE IF NOT EXISTS vendas (id TEXT PRIMARY KEY, posicao INTEGER NOT NULL)")
+        conexao.execute("CREATE INDEX IF NOT EXISTS vendas_posicao ON vendas (posicao)")
+        conexao.commit()
+        return conexao
+
+    # Descarta o que uma sincronização interrompida deixou após o último checkpoint
+    # (em vendas.jsonl e no índice) e indexa as vendas confirmadas que faltarem no índice
+    # (índice novo ou apagado). Sem isso, a próxima execução transferiria de novo as mesmas
+    # vendas, ou descartaria como duplicadas vendas que nunca foram confirmadas.
+    def _desfazer_sincronizacao_incompleta(self, indice: sqlite3.Connection, checkpoint: dict):
+        tamanho_confirmado = checkpoint["tamanho_vendas"]
+        if os.path.exists(self.arquivo_vendas) and os.path.getsize(self.arquivo_vendas) > tamanho_confirmado:
+            log(f"Consolidação: descartando sincronização incompleta em {self.arquivo_vendas}")
+            with open(self.arquivo_vendas, "r+b") as f:
+                f.truncate(tamanho_confirmado)
+        indice.execute("DELETE FROM vendas WHERE posicao >= ?", (tamanho_confirmado,))
+
+        # Retoma a partir da última venda indexada (ou do início, se o índice estiver vazio)
+        (ultima,) = indice.execute("SELECT MAX(posicao) FROM vendas").fetchone()
+        posicao = ultima or 0
+        if os.path.exists(self.arquivo_vendas) and posicao < tamanho_confirmado:
+            with open(self.arquivo_vendas, "rb") as f:
+                f.seek(posicao)
+                for linha in f:
+                    if linha.strip():
+                        indice.execute("INSERT OR IGNORE INTO vendas (id, posicao) VALUES (?, ?)",
+                                       (json.loads(linha)["id"], posicao))
+                    posicao += len(linha)
+        indice.commit()
+
+    # Mescla (k-way) as vendas novas de todas as lojas por data_hora e acrescenta à base central.
+    # Retorna (vendas gravadas, duplicadas descartadas).
+    def _mesclar_vendas(self, indice: sqlite3.Connection, diarios: list[DiarioLoja]) -> tuple[int, int]:
+        fluxos = [d.vendas_novas() for d in diarios]
+        gravadas = duplicadas = 0
+        with open(self.arquivo_vendas, "ab") as f:
+            for venda in heapq.merge(*fluxos, key=lambda v: v["data_hora"]):
+                # A inserção falha em silêncio (rowcount 0) se o ID já estiver no índice
+                cursor = indice.execute("INSERT OR IGNORE INTO vendas (id, posicao) VALUES (?, ?)",
+                                        (venda["id"], f.tell()))
+                if cursor.rowcount == 0:
+                    duplicadas += 1
+                    continue
+                f.write((json.dumps(venda, ensure_ascii=False) + "\n").encode("utf-8"))
+                gravadas += 1
+            f.flush()
+            os.fsync(f.fileno())
+        # Confirmado depois das vendas: se cair antes do checkpoint, a próxima execução
+        # apaga do índice tudo o que estiver além do tamanho confirmado
+        indice.commit()
+        return gravadas, duplicadas
+
+    # Substitui no catálogo central os produtos das lojas cujo catálogo mudou.
+    # Retorna os nomes das lojas atualizadas.
+    def _atualizar_catalogos(self, diarios: list[DiarioLoja]) -> list[str]:
+        alteradas = [d for d in diarios if d.assinatura_catalogo_atual() != d.assinatura_catalogo]
+        if not alteradas:
+            return []
+
+        # 1. Lê todos os catálogos alterados antes de mexer no catálogo central
+        novos = {}
+        for diario in alteradas:
+            assinatura = diario.assinatura_catalogo_atual()
+            produtos = []
+            if assinatura is not None:
+                try:
+                    with open(diario.arquivo_produtos, "r", encoding="utf-8") as f:
+                        produtos = json.load(f)
+                except (json.JSONDecodeError, OSError) as e:
+                    # Mantém os produtos e a assinatura antigos para tentar de novo na próxima execução
+                    log(f"ERRO ao ler catálogo da loja {diario.nome}: {e}")
+                    continue
+            novos[diario.nome] = (assinatura, produtos)
+        if not novos:
+            return []
+
+        # 2. Só substitui os produtos das lojas cuja leitura deu certo
+        catalogo = []
+        if os.path.exists(self.arquivo_produtos):
+            with open(self.arquivo_produtos, "r", encoding="utf-8") as f:
+                catalogo = json.load(f)
+        catalogo = [p for p in catalogo if p.get("loja") not in novos]
+        for diario in alteradas:
+            if diario.nome in novos:
+                assinatura, produtos = novos[diario.nome]
+                catalogo.extend(dict(p, loja=diario.nome) for p in produtos)
+                diario.assinatura_catalogo = assinatura
+        catalogo.sort(key=lambda p: (p["loja"], p["codigo"]))
+        _salvar_json_atomico(self.arquivo_produtos, catalogo, indent=2)
+        return sorted(novos)
+
+    # Executa uma sincronização completa das lojas informadas e retorna um resumo
+    def sincronizar(self, pastas_lojas: list[str]) -> dict:
+        os.makedirs(self.pasta_central, exist_ok=True)
+        diarios = []
+        checkpoint = self.carregar_checkpoint()
+        for pasta in pastas_lojas:
+            nome = os.path.basename(os.path.normpath(pasta))
+            diarios.append(DiarioLoja(pasta, checkpoint["lojas"].get(nome, {})))
+        if len({d.nome for d in diarios}) != len(diarios):
+            raise ValueError("Duas lojas com o mesmo nome de pasta.")
+
+        indice = self._abrir_indice()
+        try:
+            self._desfazer_sincronizacao_incompleta(indice, checkpoint)
+            gravadas, duplicadas = self._mesclar_vendas(indice, diarios)
+        finally:
+            indice.close()
+        catalogos = self._atualizar_catalogos(diarios)
+
+        # O checkpoint é gravado por último: se algo falhar antes, nada é confirmado
+        for diario in diarios:
+            checkpoint["lojas"][diario.nome] = diario.estado()
+        checkpoint["tamanho_vendas"] = os.path.getsize(self.arquivo_vendas)
+        checkpoint.pop("tamanho_ids", None)
+        _salvar_json_atomico(self.arquivo_checkpoint, checkpoint, indent=2)
+
+        log(f"Consolidação: {gravadas} vendas novas, {duplicadas} duplicadas, catálogos: {catalogos}")
+        return {"vendas_novas": gravadas, "duplicadas": duplicadas, "catalogos_atualizados": catalogos}
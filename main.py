@@ -1,22 +1,27 @@
 # main.py - Ponto de entrada do sistema
 # Importa a classe Sistema do módulo controllers.sistema
+import os
 from controllers.sistema import Sistema
+from utils.tela import Tela, SpoolImpressora, MENU_PRINCIPAL
+
+# Variável de ambiente com a pasta do spool da impressora de recibos (opcional)
+VARIAVEL_SPOOL = "MERCADO_SPOOL"
+
+# Retorna o spool configurado em MERCADO_SPOOL, ou None para não imprimir recibos
+def impressora_configurada():
+    pasta = os.environ.get(VARIAVEL_SPOOL, "").strip()
+    return SpoolImpressora(pasta) if pasta else None
 
 # Função que exibe o menu principal e controla escolhas do usuário
 def menu_principal():
-    # Cria a instância do Sistema (carrega produtos e configura o caixa)
-    sistema = Sistema()
+    # Cria a instância do Sistema (produtos e caixa são carregados no primeiro uso);
+    # com MERCADO_SPOOL definida, os recibos também vão para a pasta do spool
+    sistema = Sistema(impressora=impressora_configurada())
 
     # Loop principal do programa (executa até o usuário escolher sair)
     while True:
-        # Exibe o cabeçalho do menu
-        print("\n===== SISTEMA DO MERCADO - VERSÃO CORRIGIDA =====")
-        # Opção para gerenciar produtos
-        print("[1] Gerenciar produtos (adicionar / listar / editar)")
-        # Opção para abrir o caixa (atender clientes)
-        print("[2] Abrir caixa e iniciar atendimento")
-        # Opção para sair do programa
-        print("[3] Fechar programa")
+        # Exibe o menu (cabeçalho e opções 1-3, ver utils/tela.py) em uma única escrita
+        Tela().linhas(MENU_PRINCIPAL).emitir()
 
         # Lê a opção do usuário (string) e remove espaços em branco
         opc = input("Escolha uma opção: ").strip()
@@ -29,6 +34,8 @@ def menu_principal():
             sistema.abrir_caixa_e_atender()
         # Se usuário escolher 3, encerra o loop e finaliza o programa
         elif opc == "3":
+            # Grava o snapshot do catálogo (se houve alterações) antes de sair
+            sistema.encerrar()
             print("Encerrando o sistema. Até mais!")
             break
         # Qualquer outra entrada é inválida e solicita nova tentativa
@@ -3,20 +3,32 @@ import datetime
 import json
 import csv
 import os
+import uuid
+from utils.tela import recibo_fechamento
 
 class Caixa:
     # Construtor: define arquivos de persistência para histórico de vendas
-    def __init__(self, arquivo_vendas: str = "data/vendas.json", arquivo_vendas_csv: str = "data/vendas.csv"):
+    # arquivo_journal: diário append-only (uma venda JSON por linha) lido pela consolidação entre lojas
+    def __init__(self, arquivo_vendas: str = "data/vendas.json", arquivo_vendas_csv: str = "data/vendas.csv",
+                 arquivo_journal: str = "data/vendas.jsonl"):
         self._total_dia = 0.0
         self._itens_vendidos = 0
         self.arquivo_vendas = arquivo_vendas
         self.arquivo_vendas_csv = arquivo_vendas_csv
-        # Garante que o CSV tenha cabeçalho caso não exista
+        self.arquivo_journal = arquivo_journal
+        # O CSV só é preparado na primeira venda (abrir o caixa não toca o disco)
+        self._csv_pronto = False
+
+    # Garante que o CSV tenha cabeçalho caso não exista
+    def _garantir_csv(self):
+        if self._csv_pronto:
+            return
         if not os.path.exists(self.arquivo_vendas_csv):
             os.makedirs(os.path.dirname(self.arquivo_vendas_csv), exist_ok=True)
             with open(self.arquivo_vendas_csv, "w", encoding="utf-8", newline='') as f:
                 writer = csv.writer(f)
                 writer.writerow(["data_hora", "total", "itens", "forma", "cupom"])
+        self._csv_pronto = True
 
     # Registra a venda atualizando totais e salvando histórico
     def registrar_venda(self, total_compra: float, itens_vendidos: int, forma: str, cupom: str = None):
@@ -25,6 +37,7 @@ class Caixa:
         self._itens_vendidos += int(itens_vendidos)
         # Cria registro da venda
         venda = {
+            "id": uuid.uuid4().hex,
             "data_hora": datetime.datetime.now().isoformat(),
             "total": float(total_compra),
             "itens": int(itens_vendidos),
@@ -46,26 +59,32 @@ class Caixa:
         with open(self.arquivo_vendas, "w", encoding="utf-8") as f:
             json.dump(vendas, f, ensure_ascii=False, indent=2)
         # Adiciona linha no CSV também
+        self._garantir_csv()
         with open(self.arquivo_vendas_csv, "a", encoding="utf-8", newline='') as f:
             writer = csv.writer(f)
             writer.writerow([venda["data_hora"], venda["total"], venda["itens"], venda["forma"], venda["cupom"]])
+        # Acrescenta a venda ao diário (nunca reescrito, só cresce no final); a pasta
+        # do diário pode ser diferente da do JSON
+        os.makedirs(os.path.dirname(self.arquivo_journal) or ".", exist_ok=True)
+        with open(self.arquivo_journal, "a", encoding="utf-8") as f:
+            f.write(json.dumps(venda, ensure_ascii=False) + "\n")
 
     # Gera o fechamento do caixa em arquivo TXT e imprime no console
-    def fechamento(self, pasta_reports: str = "reports") :
+    # impressora: destino opcional (ex.: SpoolImpressora) que recebe uma cópia do relatório
+    def fechamento(self, pasta_reports: str = "reports", impressora=None) :
         # Formata timestamp para nome do arquivo
         agora = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         # Define o caminho do arquivo de fechamento
         nome_arquivo = os.path.join(pasta_reports, f"fechamento_{agora}.txt")
         # Garante que a pasta exista
         os.makedirs(os.path.dirname(nome_arquivo), exist_ok=True)
-        # Escreve o conteúdo do relatório
+        # Monta o relatório uma vez: as linhas base servem ao arquivo e ao console,
+        # cada um com seu rodapé
+        relatorio = recibo_fechamento(self._total_dia, self._itens_vendidos)
+        conteudo_arquivo = relatorio.texto() + "===============================\n"
         with open(nome_arquivo, "w", encoding="utf-8") as f:
-            f.write("===== FECHAMENTO DO CAIXA =====\n")
-            f.write(f"Total arrecadado no dia: R$ {self._total_dia:.2f}\n")
-            f.write(f"Total de itens vendidos: {self._itens_vendidos}\n")
-            f.write("===============================\n")
-        # Imprime no console o resumo do fechamento
-        print("===== FECHAMENTO DO CAIXA =====")
-        print(f"Total arrecadado no dia: R$ {self._total_dia:.2f}")
-        print(f"Total de itens vendidos: {self._itens_vendidos}")
-        print(f"Relatório salvo em: {nome_arquivo}")
+            f.write(conteudo_arquivo)
+        if impressora is not None:
+            impressora.enviar(conteudo_arquivo, prefixo="fechamento")
+        # Imprime no console o resumo do fechamento (mesmo buffer, uma única escrita)
+        relatorio.linha(f"Relatório salvo em: {nome_arquivo}").emitir()
@@ -101,4 +101,16 @@ class Produto:
     # Cria um Produto a partir de um dicionário (útil ao carregar JSON)
     @staticmethod
     def from_dict(d: dict):
-        return Produto(d["codigo"], d["nome"], d["preco"], d.get("estoque", 0), d.get("estoque_minimo", 2))
\ No newline at end of file
+        return Produto(d["codigo"], d["nome"], d["preco"], d.get("estoque", 0), d.get("estoque_minimo", 2))
+
+    # Cria um Produto a partir de valores já tipados (usado ao carregar o snapshot binário).
+    # Pula as conversões do construtor, que dominam o tempo de carga de catálogos grandes.
+    @staticmethod
+    def from_registro(codigo: int, nome: str, preco: float, estoque: int, estoque_minimo: int):
+        produto = Produto.__new__(Produto)
+        produto._codigo = codigo
+        produto._nome = nome
+        produto._preco = preco
+        produto._estoque = estoque
+        produto._estoque_minimo = estoque_minimo
+        return produto
\ No newline at end of file
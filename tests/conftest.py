@@ -0,0 +1,50 @@
+# tests/conftest.py - Configuração comum dos testes
+# Os módulos do projeto usam caminhos relativos (data/, logs/, reports/), então todo
+# teste roda dentro de uma pasta temporária própria.
+import os
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+
+def pytest_addoption(parser):
+    grupo = parser.getgroup("desempenho")
+    grupo.addoption("--perf", action="store_true", default=False,
+                    help="executa a suíte de desempenho (tests/perf)")
+    grupo.addoption("--perf-tamanhos", default="1000,100000",
+                    help="tamanhos de catálogo separados por vírgula (ex.: 1000,100000,1000000)")
+    grupo.addoption("--perf-limite", type=float, default=1.5,
+                    help="fator máximo aceito sobre a baseline antes de falhar (padrão: 1.5)")
+    grupo.addoption("--atualizar-baselines", action="store_true", default=False,
+                    help="grava os tempos medidos como novas baselines em vez de comparar")
+
+
+def pytest_generate_tests(metafunc):
+    # Parametriza os testes de desempenho pelos tamanhos pedidos na linha de comando
+    if "tamanho" in metafunc.fixturenames:
+        tamanhos = [int(t) for t in metafunc.config.getoption("--perf-tamanhos").split(",") if t.strip()]
+        metafunc.parametrize("tamanho", tamanhos, ids=[f"n{t}" for t in tamanhos], scope="module")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--perf"):
+        return
+    pular = pytest.mark.skip(reason="suíte de desempenho: use --perf")
+    for item in items:
+        if "perf" in item.keywords:
+            item.add_marker(pular)
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "perf: teste de desempenho com baseline (só roda com --perf)")
+
+
+# Cada teste roda em uma pasta temporária (arquivos de dados, log e relatórios isolados)
+@pytest.fixture(autouse=True)
+def pasta_temporaria(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
@@ -0,0 +1,94 @@
+# tests/perf/conftest.py - Medição de desempenho com baselines versionadas
+# Cada medição guarda o melhor tempo (mínimo de algumas repetições) e o compara com
+# tests/perf/baselines.json. O teste falha se o tempo passar de baseline * --perf-limite
+# mais uma folga: pequena para operações de CPU, maior para as que dependem do disco.
+# As baselines dependem da máquina: regrave-as na máquina de referência com
+#   python -m pytest tests/perf --perf --perf-tamanhos=1000,100000,1000000 --atualizar-baselines
+import json
+import os
+import time
+
+import pytest
+
+from models.produto import Produto
+
+ARQUIVO_BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+# Folga absoluta (segundos) para não falhar por ruído em operações de microssegundos
+FOLGA_SEGUNDOS = 0.001
+# Operações de arquivo (fsync, cache de páginas) variam bem mais entre execuções que as
+# de CPU: recebem folga absoluta maior e mais uma fração da baseline sobre o limite
+FOLGA_IO_SEGUNDOS = 0.010
+FOLGA_IO_RELATIVA = 0.5
+# Rodadas extras de medição antes de acusar regressão: ruído da máquina some ao
+# remedir, uma regressão de verdade continua acima do limite
+RODADAS_EXTRAS = 2
+
+
+# Quantas repetições medir: catálogos grandes demoram o bastante para uma medição só
+@pytest.fixture(scope="module")
+def repeticoes(tamanho) -> int:
+    if tamanho <= 1000:
+        return 7
+    if tamanho <= 100000:
+        return 3
+    return 1
+
+
+@pytest.fixture(scope="session")
+def baselines(request):
+    dados = {}
+    if os.path.exists(ARQUIVO_BASELINES):
+        with open(ARQUIVO_BASELINES, encoding="utf-8") as f:
+            dados = json.load(f)
+    yield dados
+    if request.config.getoption("--atualizar-baselines"):
+        with open(ARQUIVO_BASELINES, "w", encoding="utf-8") as f:
+            json.dump(dict(sorted(dados.items())), f, indent=2)
+            f.write("\n")
+
+
+@pytest.fixture
+def desempenho(request, baselines):
+    atualizar = request.config.getoption("--atualizar-baselines")
+    fator = request.config.getoption("--perf-limite")
+
+    # Melhor tempo de funcao() em algumas repetições
+    def rodada(funcao, repeticoes: int) -> float:
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            funcao()
+            tempos.append(time.perf_counter() - inicio)
+        return min(tempos)
+
+    # io=True para operações limitadas por leitura/escrita de arquivos
+    def medir(nome: str, funcao, repeticoes: int = 5, io: bool = False) -> float:
+        melhor = rodada(funcao, repeticoes)
+
+        if atualizar:
+            baselines[nome] = round(melhor, 6)
+            return melhor
+        base = baselines.get(nome)
+        if base is None:
+            pytest.fail(f"Sem baseline para '{nome}'. Rode com --atualizar-baselines.")
+        if io:
+            limite = base * (fator + FOLGA_IO_RELATIVA) + FOLGA_IO_SEGUNDOS
+        else:
+            limite = base * fator + FOLGA_SEGUNDOS
+        for _ in range(RODADAS_EXTRAS):
+            if melhor <= limite:
+                break
+            melhor = min(melhor, rodada(funcao, repeticoes))
+        assert melhor <= limite, (
+            f"Regressão em '{nome}': {melhor * 1000:.2f} ms > limite {limite * 1000:.2f} ms "
+            f"(baseline {base * 1000:.2f} ms)"
+        )
+        return melhor
+
+    return medir
+
+
+# Catálogo sintético do tamanho pedido (compartilhado pelos testes do módulo)
+@pytest.fixture(scope="module")
+def catalogo(tamanho) -> list[Produto]:
+    return [Produto(i, f"Produto de teste nº {i}", 1 + (i % 997) * 0.37, 10 + i % 90, 5) for i in range(1, tamanho + 1)]
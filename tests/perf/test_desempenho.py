@@ -0,0 +1,125 @@
+# tests/perf/test_desempenho.py - Suíte de desempenho dos modelos e da persistência
+# Só roda com --perf (ver tests/conftest.py); tamanhos com --perf-tamanhos.
+import json
+import os
+import random
+import time
+
+import pytest
+
+from controllers.sistema import Sistema
+from models.caixa import Caixa
+from models.carrinho import Carrinho
+from models.pagamento import Pagamento
+from models.produto import Produto
+from utils.snapshot import carregar_snapshot, salvar_snapshot
+
+pytestmark = pytest.mark.perf
+
+
+def _sistema_com(catalogo) -> Sistema:
+    sistema = Sistema()
+    sistema.produtos = catalogo
+    return sistema
+
+
+def test_busca_produto(desempenho, repeticoes, catalogo, tamanho):
+    sistema = _sistema_com(catalogo)
+    codigos = random.Random(1).sample(range(1, tamanho + 1), min(tamanho, 20))
+
+    def buscar():
+        for codigo in codigos:
+            assert sistema.buscar_produto(codigo) is not None
+
+    desempenho(f"busca_produto[n{tamanho}]", buscar, repeticoes)
+
+
+def test_total_carrinho(desempenho, repeticoes, catalogo, tamanho):
+    carrinho = Carrinho()
+    for p in catalogo:
+        carrinho.adicionar(Produto(p.codigo, p.nome, p.preco, 1, 0), 1)
+
+    def totalizar():
+        carrinho.calcular_total()
+        carrinho.total_itens()
+
+    desempenho(f"total_carrinho[n{tamanho}]", totalizar, repeticoes)
+
+
+def test_calculo_pagamento(desempenho, repeticoes, catalogo, tamanho):
+    precos = [p.preco for p in catalogo]
+
+    def precificar():
+        for i, preco in enumerate(precos):
+            Pagamento(preco, "CUPOM10" if i % 3 == 0 else None).calcular_pagamento(i % 6 + 1)
+
+    desempenho(f"calculo_pagamento[n{tamanho}]", precificar, repeticoes)
+
+
+def test_registro_venda(desempenho, repeticoes, tamanho):
+    # O histórico em vendas.json tem o mesmo número de vendas que o catálogo de produtos
+    historico = [{"id": f"{i:032x}", "data_hora": f"2025-01-01T00:00:{i % 60:02d}.{i:06d}", "total": 10.0,
+                  "itens": 1, "forma": "PIX", "cupom": "N/A"} for i in range(tamanho)]
+    os.makedirs("data")
+    with open("data/vendas.json", "w", encoding="utf-8") as f:
+        json.dump(historico, f, ensure_ascii=False, indent=2)
+    caixa = Caixa()
+
+    desempenho(f"registro_venda[n{tamanho}]", lambda: caixa.registrar_venda(12.5, 2, "PIX"),
+               repeticoes, io=True)
+
+
+def test_salvar_catalogo_json(desempenho, repeticoes, catalogo, tamanho):
+    sistema = _sistema_com(catalogo)
+    sistema.COMPACTAR_A_CADA = float("inf")
+    desempenho(f"salvar_catalogo_json[n{tamanho}]", sistema.salvar_produtos, repeticoes, io=True)
+
+
+def test_carregar_catalogo_json(desempenho, repeticoes, catalogo, tamanho):
+    sistema = _sistema_com(catalogo)
+    sistema.COMPACTAR_A_CADA = float("inf")
+    sistema.salvar_produtos()
+
+    def carregar():
+        with open(Sistema.ARQUIVO_PRODUTOS, "rb") as f:
+            sistema._carregar_json(f.read())
+
+    desempenho(f"carregar_catalogo_json[n{tamanho}]", carregar, repeticoes, io=True)
+
+
+def test_salvar_snapshot(desempenho, repeticoes, catalogo, tamanho):
+    desempenho(f"salvar_snapshot[n{tamanho}]", lambda: salvar_snapshot(Sistema.ARQUIVO_SNAPSHOT, catalogo),
+               repeticoes, io=True)
+
+
+def test_carregar_snapshot(desempenho, repeticoes, catalogo, tamanho):
+    salvar_snapshot(Sistema.ARQUIVO_SNAPSHOT, catalogo)
+    desempenho(f"carregar_snapshot[n{tamanho}]", lambda: carregar_snapshot(Sistema.ARQUIVO_SNAPSHOT),
+               repeticoes, io=True)
+
+
+# O snapshot binário existe para carregar bem mais rápido que o JSON
+def test_snapshot_mais_rapido_que_json(catalogo, tamanho):
+    if tamanho < 10000:
+        pytest.skip("catálogo pequeno demais para comparar")
+    sistema = _sistema_com(catalogo)
+    sistema.COMPACTAR_A_CADA = float("inf")
+    sistema.salvar_produtos()
+    sistema.compactar()
+
+    def melhor_tempo(funcao):
+        tempos = []
+        for _ in range(3):
+            inicio = time.perf_counter()
+            funcao()
+            tempos.append(time.perf_counter() - inicio)
+        return min(tempos)
+
+    def carregar_json():
+        with open(Sistema.ARQUIVO_PRODUTOS, "rb") as f:
+            sistema._carregar_json(f.read())
+
+    tempo_json = melhor_tempo(carregar_json)
+    # Caminho real da carga rápida: lê o JSON só para conferir a assinatura e usa o snapshot
+    tempo_snapshot = melhor_tempo(Sistema().carregar_produtos)
+    assert tempo_snapshot * 2 <= tempo_json, f"snapshot {tempo_snapshot:.3f}s vs JSON {tempo_json:.3f}s"
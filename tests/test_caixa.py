@@ -0,0 +1,72 @@
+# tests/test_caixa.py - Registro de vendas e fechamento do caixa
+import csv
+import json
+import os
+
+from models.caixa import Caixa
+
+
+def test_abrir_caixa_nao_cria_arquivos():
+    Caixa()
+    assert not os.path.exists("data")
+
+
+def test_registrar_venda_persiste_json_csv_e_diario():
+    caixa = Caixa()
+    caixa.registrar_venda(10.5, 2, "PIX")
+    caixa.registrar_venda(4.0, 1, "Débito", "CUPOM5")
+
+    with open("data/vendas.json", encoding="utf-8") as f:
+        vendas = json.load(f)
+    with open("data/vendas.csv", encoding="utf-8", newline="") as f:
+        linhas = list(csv.reader(f))
+    with open("data/vendas.jsonl", encoding="utf-8") as f:
+        diario = [json.loads(linha) for linha in f]
+
+    assert [v["total"] for v in vendas] == [10.5, 4.0]
+    assert linhas[0] == ["data_hora", "total", "itens", "forma", "cupom"]
+    assert len(linhas) == 3
+    assert diario == vendas
+    assert len({v["id"] for v in vendas}) == 2
+
+
+def test_diario_em_outra_pasta():
+    caixa = Caixa(arquivo_journal="diario/loja/vendas.jsonl")
+    caixa.registrar_venda(3, 1, "PIX")
+    with open("diario/loja/vendas.jsonl", encoding="utf-8") as f:
+        assert json.loads(f.readline())["total"] == 3
+
+
+def test_fechamento_soma_vendas(capsys):
+    caixa = Caixa()
+    for total, itens in [(10, 1), (20.25, 3), (5.5, 2)]:
+        caixa.registrar_venda(total, itens, "PIX")
+    caixa.fechamento()
+
+    saida = capsys.readouterr().out
+    assert "Total arrecadado no dia: R$ 35.75" in saida
+    assert "Total de itens vendidos: 6" in saida
+    (relatorio,) = os.listdir("reports")
+    with open(os.path.join("reports", relatorio), encoding="utf-8") as f:
+        assert f.read() == (
+            "===== FECHAMENTO DO CAIXA =====\n"
+            "Total arrecadado no dia: R$ 35.75\n"
+            "Total de itens vendidos: 6\n"
+            "===============================\n"
+        )
+
+
+def test_fechamento_envia_copia_para_spool(capsys):
+    from utils.tela import SpoolImpressora
+
+    spool = SpoolImpressora("spool")
+    caixa = Caixa()
+    caixa.registrar_venda(7, 1, "PIX")
+    caixa.fechamento(impressora=spool)
+
+    (recibo,) = spool.pendentes()
+    assert os.path.basename(recibo).endswith("_fechamento.txt")
+    with open(recibo, encoding="utf-8") as f:
+        assert "R$ 7.00" in f.read()
+    capsys.readouterr()
+
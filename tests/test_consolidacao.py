@@ -0,0 +1,220 @@
+# tests/test_consolidacao.py - Consolidação de várias lojas (pastas locais fazem o papel das lojas)
+import json
+import os
+
+import pytest
+
+from controllers.consolidacao import Consolidacao
+from models.caixa import Caixa
+
+
+def _caixa(loja: str) -> Caixa:
+    base = os.path.join("lojas", loja, "data")
+    return Caixa(os.path.join(base, "vendas.json"), os.path.join(base, "vendas.csv"), os.path.join(base, "vendas.jsonl"))
+
+
+def _catalogo(loja: str, produtos: list[dict]):
+    with open(os.path.join("lojas", loja, "data", "produtos.json"), "w", encoding="utf-8") as f:
+        json.dump(produtos, f)
+
+
+def _vendas_centrais() -> list[dict]:
+    with open(os.path.join("central", "vendas.jsonl"), encoding="utf-8") as f:
+        return [json.loads(linha) for linha in f]
+
+
+LOJAS = [os.path.join("lojas", "centro"), os.path.join("lojas", "bairro")]
+
+
+def test_mescla_ordenada_e_incremental():
+    centro, bairro = _caixa("centro"), _caixa("bairro")
+    for i in range(3):
+        centro.registrar_venda(10 + i, 1, "PIX")
+        bairro.registrar_venda(20 + i, 1, "PIX")
+    _catalogo("centro", [{"codigo": 1, "nome": "Leite", "preco": 4.2, "estoque": 3, "estoque_minimo": 1}])
+
+    resumo = Consolidacao("central").sincronizar(LOJAS)
+    assert resumo["vendas_novas"] == 6
+    assert resumo["catalogos_atualizados"] == ["centro"]
+    vendas = _vendas_centrais()
+    assert [v["data_hora"] for v in vendas] == sorted(v["data_hora"] for v in vendas)
+    assert {v["loja"] for v in vendas} == {"centro", "bairro"}
+
+    # Sem novidades: nada é transferido
+    resumo = Consolidacao("central").sincronizar(LOJAS)
+    assert resumo == {"vendas_novas": 0, "duplicadas": 0, "catalogos_atualizados": []}
+
+    bairro.registrar_venda(99, 2, "Débito")
+    resumo = Consolidacao("central").sincronizar(LOJAS)
+    assert resumo["vendas_novas"] == 1
+    assert len(_vendas_centrais()) == 7
+
+
+def test_duplicadas_e_sincronizacao_interrompida():
+    centro = _caixa("centro")
+    centro.registrar_venda(10, 1, "PIX")
+    centro.registrar_venda(11, 1, "PIX")
+    # A mesma venda repetida no diário conta uma única vez
+    caminho = os.path.join("lojas", "centro", "data", "vendas.jsonl")
+    with open(caminho, encoding="utf-8") as f:
+        primeira = f.readline()
+    with open(caminho, "a", encoding="utf-8") as f:
+        f.write(primeira)
+
+    resumo = Consolidacao("central").sincronizar(LOJAS[:1])
+    assert (resumo["vendas_novas"], resumo["duplicadas"]) == (2, 1)
+
+    # Lixo de uma sincronização interrompida e linha ainda sendo gravada na loja
+    with open(os.path.join("central", "vendas.jsonl"), "a", encoding="utf-8") as f:
+        f.write('{"parcial": ')
+    with open(caminho, "a", encoding="utf-8") as f:
+        f.write('{"id": "incompleta"')
+    resumo = Consolidacao("central").sincronizar(LOJAS[:1])
+    assert resumo["vendas_novas"] == 0
+    assert len(_vendas_centrais()) == 2
+
+
+def test_vendas_antigas_sem_id_importadas_uma_vez():
+    os.makedirs(os.path.join("lojas", "centro", "data"))
+    with open(os.path.join("lojas", "centro", "data", "vendas.json"), "w", encoding="utf-8") as f:
+        json.dump([{"data_hora": "2025-01-01T10:00:00", "total": 5.0, "itens": 1, "forma": "PIX", "cupom": "N/A"}], f)
+
+    assert Consolidacao("central").sincronizar(LOJAS[:1])["vendas_novas"] == 1
+    assert Consolidacao("central").sincronizar(LOJAS[:1])["vendas_novas"] == 0
+    (venda,) = _vendas_centrais()
+    assert venda["id"].startswith("legado-")
+
+
+def test_catalogo_ilegivel_mantem_produtos_anteriores():
+    _caixa("centro").registrar_venda(1, 1, "PIX")
+    _caixa("bairro").registrar_venda(1, 1, "PIX")
+    _catalogo("centro", [{"codigo": 1, "nome": "Leite", "preco": 4.2, "estoque": 3, "estoque_minimo": 1}])
+    _catalogo("bairro", [{"codigo": 2, "nome": "Café", "preco": 30.0, "estoque": 5, "estoque_minimo": 1}])
+    Consolidacao("central").sincronizar(LOJAS)
+
+    with open(os.path.join("lojas", "centro", "data", "produtos.json"), "w", encoding="utf-8") as f:
+        f.write('[{"codigo": 1,')
+    _catalogo("bairro", [{"codigo": 3, "nome": "Açúcar", "preco": 5.0, "estoque": 9, "estoque_minimo": 1}])
+    resumo = Consolidacao("central").sincronizar(LOJAS)
+
+    assert resumo["catalogos_atualizados"] == ["bairro"]
+    with open(os.path.join("central", "produtos.json"), encoding="utf-8") as f:
+        central = {(p["loja"], p["codigo"]) for p in json.load(f)}
+    assert central == {("centro", 1), ("bairro", 3)}
+
+    # Depois de corrigido, o catálogo da loja é lido de novo
+    _catalogo("centro", [{"codigo": 4, "nome": "Sal", "preco": 2.0, "estoque": 1, "estoque_minimo": 1}])
+    assert Consolidacao("central").sincronizar(LOJAS)["catalogos_atualizados"] == ["centro"]
+
+
+def test_id_repetido_em_execucao_posterior_e_descartado():
+    centro = _caixa("centro")
+    centro.registrar_venda(10, 1, "PIX")
+    assert Consolidacao("central").sincronizar(LOJAS[:1])["vendas_novas"] == 1
+
+    caminho = os.path.join("lojas", "centro", "data", "vendas.jsonl")
+    with open(caminho, encoding="utf-8") as f:
+        primeira = f.readline()
+    with open(caminho, "a", encoding="utf-8") as f:
+        f.write(primeira)
+    centro.registrar_venda(11, 1, "PIX")
+
+    resumo = Consolidacao("central").sincronizar(LOJAS[:1])
+    assert (resumo["vendas_novas"], resumo["duplicadas"]) == (1, 1)
+    ids = [v["id"] for v in _vendas_centrais()]
+    assert len(ids) == len(set(ids)) == 2
+
+
+def test_diario_rotacionado_e_relido():
+    centro = _caixa("centro")
+    for total in (10, 11, 12):
+        centro.registrar_venda(total, 1, "PIX")
+    Consolidacao("central").sincronizar(LOJAS[:1])
+
+    # Rotação: o diário é substituído por um arquivo novo, menor que o offset salvo
+    caminho = os.path.join("lojas", "centro", "data", "vendas.jsonl")
+    os.replace(caminho, caminho + ".1")
+    centro.registrar_venda(13, 1, "PIX")
+    resumo = Consolidacao("central").sincronizar(LOJAS[:1])
+    assert resumo["vendas_novas"] == 1
+    assert [v["total"] for v in _vendas_centrais()] == [10, 11, 12, 13]
+
+    # Substituição por um arquivo maior com as vendas antigas + novas: relido e deduplicado
+    with open(caminho + ".1", encoding="utf-8") as f:
+        antigas = f.read()
+    with open(caminho, encoding="utf-8") as f:
+        atuais = f.read()
+    with open(caminho + ".novo", "w", encoding="utf-8") as f:
+        f.write(antigas + atuais)
+    os.replace(caminho + ".novo", caminho)
+    centro.registrar_venda(14, 1, "PIX")
+    resumo = Consolidacao("central").sincronizar(LOJAS[:1])
+    assert (resumo["vendas_novas"], resumo["duplicadas"]) == (1, 4)
+    assert [v["total"] for v in _vendas_centrais()] == [10, 11, 12, 13, 14]
+    with open("logs/log.txt", encoding="utf-8") as f:
+        assert "rotacionado" in f.read()
+
+
+def test_indice_de_ids_apagado_e_reconstruido():
+    _caixa("centro").registrar_venda(10, 1, "PIX")
+    Consolidacao("central").sincronizar(LOJAS[:1])
+    os.remove(os.path.join("central", "vendas_ids.db"))
+    with open(os.path.join("central", "checkpoint.json"), encoding="utf-8") as f:
+        checkpoint = json.load(f)
+    checkpoint["lojas"]["centro"]["offset"] = 0
+    with open(os.path.join("central", "checkpoint.json"), "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+
+    resumo = Consolidacao("central").sincronizar(LOJAS[:1])
+    assert (resumo["vendas_novas"], resumo["duplicadas"]) == (0, 1)
+
+
+def test_indice_nao_guarda_ids_de_sincronizacao_desfeita(monkeypatch):
+    centro = _caixa("centro")
+    centro.registrar_venda(10, 1, "PIX")
+    Consolidacao("central").sincronizar(LOJAS[:1])
+    centro.registrar_venda(11, 1, "PIX")
+
+    # Queda depois de gravar vendas e índice, mas antes do checkpoint
+    def cair(*args, **kwargs):
+        raise OSError("queda simulada")
+
+    with monkeypatch.context() as m:
+        m.setattr(Consolidacao, "_atualizar_catalogos", cair)
+        with pytest.raises(OSError):
+            Consolidacao("central").sincronizar(LOJAS[:1])
+
+    resumo = Consolidacao("central").sincronizar(LOJAS[:1])
+    assert (resumo["vendas_novas"], resumo["duplicadas"]) == (1, 0)
+    assert [v["total"] for v in _vendas_centrais()] == [10, 11]
+
+
+def test_checkpoint_ausente_nao_apaga_a_base_central():
+    centro = _caixa("centro")
+    for total in (10, 11, 12):
+        centro.registrar_venda(total, 1, "PIX")
+    Consolidacao("central").sincronizar(LOJAS[:1])
+    caminho = os.path.join("lojas", "centro", "data", "vendas.jsonl")
+    os.replace(caminho, caminho + ".1")
+    centro.registrar_venda(13, 1, "PIX")
+    Consolidacao("central").sincronizar(LOJAS[:1])
+
+    os.remove(os.path.join("central", "checkpoint.json"))
+    resumo = Consolidacao("central").sincronizar(LOJAS[:1])
+    assert (resumo["vendas_novas"], resumo["duplicadas"]) == (0, 1)
+    assert [v["total"] for v in _vendas_centrais()] == [10, 11, 12, 13]
+    with open("logs/log.txt", encoding="utf-8") as f:
+        assert "checkpoint ausente" in f.read()
+
+
+def test_linha_de_comando(capsys):
+    import consolidar
+
+    _caixa("centro").registrar_venda(10, 1, "PIX")
+    _catalogo("centro", [{"codigo": 1, "nome": "Leite", "preco": 4.2, "estoque": 3, "estoque_minimo": 1}])
+    consolidar.main(["--central", "base", LOJAS[0]])
+
+    saida = capsys.readouterr().out
+    assert "Vendas novas transferidas: 1" in saida
+    assert "Catálogos atualizados: centro" in saida
+    assert os.path.exists(os.path.join("base", "vendas.jsonl"))
@@ -0,0 +1,34 @@
+# tests/test_pagamento.py - Cálculo do valor final por forma de pagamento e cupom
+import random
+
+import pytest
+
+from models.pagamento import Pagamento
+
+FATORES = {1: 0.90, 2: 0.95, 3: 1.00, 4: 1.05, 5: 1.10, 6: 1.15}
+CUPONS = {"": 1.0, "CUPOM10": 0.90, " cupom5 ": 0.95, "XYZ": 1.0}
+
+
+@pytest.mark.parametrize("opcao", sorted(FATORES))
+@pytest.mark.parametrize("cupom", sorted(CUPONS))
+def test_valor_final(opcao, cupom):
+    rng = random.Random(opcao * 31 + len(cupom))
+    for _ in range(50):
+        total = round(rng.uniform(0, 5000), 2)
+        pagamento = Pagamento(total, cupom)
+        pagamento.calcular_pagamento(opcao)
+        assert pagamento.valor_final == pytest.approx(total * FATORES[opcao] * CUPONS[cupom])
+        assert pagamento.descricao
+
+
+def test_cupom_invalido_e_ignorado():
+    pagamento = Pagamento(100, "XYZ")
+    pagamento.calcular_pagamento(3)
+    assert pagamento.valor_final == 100
+    assert "Cupom inválido" in pagamento.descricao
+
+
+@pytest.mark.parametrize("opcao", [0, 7, -1])
+def test_opcao_invalida(opcao):
+    with pytest.raises(ValueError):
+        Pagamento(10).calcular_pagamento(opcao)
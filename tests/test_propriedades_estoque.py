@@ -0,0 +1,112 @@
+# tests/test_propriedades_estoque.py - Propriedades do estoque sob sequências aleatórias
+# Cada semente gera uma sequência de operações (adicionar / remover / cancelar) sobre
+# vários produtos. Depois de cada passo, o estado real é comparado com um modelo simples
+# e com as invariantes de conservação do estoque. Em caso de falha, a mensagem traz a
+# semente e o histórico, para reproduzir o caso exato.
+import random
+
+import pytest
+
+from controllers.sistema import Sistema
+from models.carrinho import Carrinho
+from models.produto import Produto
+
+SEMENTES = range(60)
+PASSOS = 150
+
+
+def _novo_catalogo(rng: random.Random) -> list[Produto]:
+    return [
+        Produto(codigo, f"Produto {codigo}", round(rng.uniform(0.5, 100), 2), rng.randint(0, 20), rng.randint(0, 5))
+        for codigo in range(1, rng.randint(2, 6) + 1)
+    ]
+
+
+def _verificar(produtos, carrinho, inicial, esperado_estoque, esperado_carrinho, historico, semente):
+    contexto = f"semente={semente} historico={historico}"
+    itens = {p.codigo: q for p, q in carrinho.listar_itens()}
+    for p in produtos:
+        # Conservação: nada some nem aparece entre estoque e carrinho
+        assert p.estoque + itens.get(p.codigo, 0) == inicial[p.codigo], contexto
+        assert p.estoque >= 0, contexto
+        assert p.estoque == esperado_estoque[p.codigo], contexto
+    assert all(q > 0 for q in itens.values()), contexto
+    assert itens == esperado_carrinho, contexto
+    assert carrinho.total_itens() == sum(itens.values()), contexto
+    assert carrinho.vazio() == (not itens), contexto
+    precos = {p.codigo: p.preco for p in produtos}
+    assert carrinho.calcular_total() == pytest.approx(sum(precos[c] * q for c, q in itens.items())), contexto
+
+
+@pytest.mark.parametrize("semente", SEMENTES)
+def test_estoque_conservado_em_sequencias_aleatorias(semente, capsys):
+    rng = random.Random(semente)
+    sistema = Sistema()
+    sistema.produtos = produtos = _novo_catalogo(rng)
+    carrinho = Carrinho()
+    inicial = {p.codigo: p.estoque for p in produtos}
+    esperado_estoque = dict(inicial)
+    esperado_carrinho = {}
+    historico = []
+
+    for _ in range(PASSOS):
+        operacao = rng.choices(["adicionar", "remover", "cancelar"], weights=[6, 4, 1])[0]
+        produto = rng.choice(produtos)
+        quantidade = rng.randint(-2, 25)
+        historico.append((operacao, produto.codigo, quantidade))
+        codigo = produto.codigo
+
+        if operacao == "adicionar":
+            if quantidade <= 0 or quantidade > esperado_estoque[codigo]:
+                with pytest.raises(ValueError):
+                    carrinho.adicionar(produto, quantidade)
+            else:
+                carrinho.adicionar(produto, quantidade)
+                esperado_estoque[codigo] -= quantidade
+                esperado_carrinho[codigo] = esperado_carrinho.get(codigo, 0) + quantidade
+        elif operacao == "remover":
+            if quantidade <= 0:
+                with pytest.raises(ValueError):
+                    carrinho.remover(produto, quantidade)
+            else:
+                carrinho.remover(produto, quantidade)
+                no_carrinho = esperado_carrinho.get(codigo, 0)
+                devolvido = min(quantidade, no_carrinho)
+                esperado_estoque[codigo] += devolvido
+                if devolvido == no_carrinho:
+                    esperado_carrinho.pop(codigo, None)
+                else:
+                    esperado_carrinho[codigo] -= devolvido
+        else:
+            sistema._cancelar_compra(carrinho)
+            esperado_estoque = dict(inicial)
+            esperado_carrinho = {}
+
+        _verificar(produtos, carrinho, inicial, esperado_estoque, esperado_carrinho, historico, semente)
+
+    # Cancelar no final sempre devolve o estoque inicial e persiste esse estado
+    sistema._cancelar_compra(carrinho)
+    assert carrinho.vazio()
+    assert {p.codigo: p.estoque for p in produtos} == inicial
+    recarregado = Sistema().carregar_produtos()
+    assert {p.codigo: p.estoque for p in recarregado} == inicial
+    capsys.readouterr()
+
+
+@pytest.mark.parametrize("semente", range(20))
+def test_operacao_invalida_nao_altera_estado(semente):
+    rng = random.Random(semente)
+    produto = Produto(1, "Arroz", 10.0, rng.randint(0, 10), 2)
+    carrinho = Carrinho()
+    if produto.estoque:
+        carrinho.adicionar(produto, rng.randint(1, produto.estoque))
+    antes = (produto.estoque, dict((p.codigo, q) for p, q in carrinho.listar_itens()))
+
+    for quantidade in (0, -1, produto.estoque + 1):
+        with pytest.raises(ValueError):
+            carrinho.adicionar(produto, quantidade)
+    for quantidade in (0, -rng.randint(1, 5)):
+        with pytest.raises(ValueError):
+            carrinho.remover(produto, quantidade)
+
+    assert (produto.estoque, dict((p.codigo, q) for p, q in carrinho.listar_itens())) == antes
@@ -0,0 +1,219 @@
+# tests/test_sistema.py - Persistência do catálogo (JSON + snapshot binário) e buscas
+import gc
+import json
+import os
+import time
+
+import pytest
+
+from controllers.sistema import Sistema
+from models.produto import Produto
+from utils.snapshot import SnapshotCorrompido, carregar_snapshot, ler_cabecalho, salvar_snapshot
+
+
+def _catalogo(n: int = 10) -> list[Produto]:
+    return [Produto(i, f"Pão de forma nº {i}", i * 1.25, i % 7, 3) for i in range(1, n + 1)]
+
+
+def _como_dict(produtos) -> list[dict]:
+    return [p.to_dict() for p in produtos]
+
+
+def test_inicializacao_nao_carrega_nada():
+    sistema = Sistema()
+    assert sistema._produtos is None
+    assert sistema._caixa is None
+    assert not os.path.exists("data")
+
+
+def test_salvar_e_carregar_json(capsys):
+    sistema = Sistema()
+    sistema.produtos = _catalogo()
+    sistema.salvar_produtos()
+    assert _como_dict(Sistema().produtos) == _como_dict(_catalogo())
+    capsys.readouterr()
+
+
+def test_snapshot_ida_e_volta():
+    produtos = _catalogo(10000) + [Produto(99999, "Açaí 🍇 500g", 19.9, 0, 0)]
+    salvar_snapshot("data/produtos.snap", produtos)
+    assert _como_dict(carregar_snapshot("data/produtos.snap")) == _como_dict(produtos)
+
+
+def test_snapshot_vazio():
+    salvar_snapshot("data/produtos.snap", [])
+    assert carregar_snapshot("data/produtos.snap") == []
+
+
+@pytest.mark.parametrize("posicao", [0, 30, 100, -3])
+def test_snapshot_corrompido_e_detectado(posicao):
+    salvar_snapshot("data/produtos.snap", _catalogo(50))
+    with open("data/produtos.snap", "r+b") as f:
+        f.seek(posicao, os.SEEK_END if posicao < 0 else os.SEEK_SET)
+        byte = f.read(1)
+        f.seek(-1, os.SEEK_CUR)
+        f.write(bytes([byte[0] ^ 0xFF]))
+    with pytest.raises(SnapshotCorrompido):
+        carregar_snapshot("data/produtos.snap")
+
+
+def test_snapshot_truncado_e_detectado():
+    salvar_snapshot("data/produtos.snap", _catalogo(50))
+    with open("data/produtos.snap", "r+b") as f:
+        f.truncate(200)
+    with pytest.raises(SnapshotCorrompido):
+        carregar_snapshot("data/produtos.snap")
+
+
+def _corromper_json():
+    # Simula uma queda no meio de uma escrita do JSON feita por fora do sistema
+    with open(Sistema.ARQUIVO_PRODUTOS, "w", encoding="utf-8") as f:
+        f.write('[{"codigo": 1,')
+
+
+def test_json_corrompido_recupera_do_snapshot(capsys):
+    sistema = Sistema()
+    sistema.produtos = _catalogo()
+    sistema.salvar_produtos()
+    sistema.compactar()
+    _corromper_json()
+
+    assert _como_dict(Sistema().produtos) == _como_dict(_catalogo())
+    saida = capsys.readouterr().out
+    assert "recuperado de data/produtos.snap, gravado em" in saida
+    assert "Alterações feitas depois disso foram perdidas" in saida
+    # O arquivo ruim é guardado e o JSON é regravado a partir do catálogo recuperado
+    with open(Sistema.ARQUIVO_PRODUTOS + ".corrompido", encoding="utf-8") as f:
+        assert f.read() == '[{"codigo": 1,'
+    with open(Sistema.ARQUIVO_PRODUTOS, encoding="utf-8") as f:
+        assert json.load(f) == _como_dict(_catalogo())
+
+
+def test_json_corrompido_sem_snapshot_nao_vira_catalogo_vazio(capsys):
+    os.makedirs("data")
+    _corromper_json()
+
+    sistema = Sistema()
+    assert sistema.produtos == []
+    saida = capsys.readouterr().out
+    assert "corrompido" in saida
+    assert "Estoque inicializado vazio" not in saida
+    assert not os.path.exists(Sistema.ARQUIVO_PRODUTOS)
+    # Salvar depois não destrói o arquivo original guardado
+    sistema.salvar_produtos()
+    with open(Sistema.ARQUIVO_PRODUTOS + ".corrompido", encoding="utf-8") as f:
+        assert f.read() == '[{"codigo": 1,'
+
+
+def test_snapshot_corrompido_usa_json(capsys):
+    sistema = Sistema()
+    sistema.produtos = _catalogo()
+    sistema.produtos[0].atualizar_estoque(42)
+    sistema.salvar_produtos()
+    sistema.compactar()
+    with open(Sistema.ARQUIVO_SNAPSHOT, "r+b") as f:
+        f.seek(-40, os.SEEK_END)
+        byte = f.read(1)
+        f.seek(-1, os.SEEK_CUR)
+        f.write(bytes([byte[0] ^ 0xFF]))
+
+    produtos = Sistema().produtos
+    assert produtos[0].estoque == 42
+    with open("logs/log.txt", encoding="utf-8") as f:
+        assert "snapshot de produtos inválido" in f.read()
+    # E o snapshot foi regravado íntegro a partir do JSON
+    assert _como_dict(carregar_snapshot(Sistema.ARQUIVO_SNAPSHOT)) == _como_dict(produtos)
+    capsys.readouterr()
+
+
+def test_snapshot_correspondente_evita_ler_o_json(monkeypatch, capsys):
+    sistema = Sistema()
+    sistema.produtos = _catalogo()
+    sistema.salvar_produtos()
+    sistema.compactar()
+
+    def falhar(self, conteudo):
+        raise AssertionError("o JSON não deveria ser convertido")
+
+    monkeypatch.setattr(Sistema, "_carregar_json", falhar)
+    assert _como_dict(Sistema().produtos) == _como_dict(_catalogo())
+    capsys.readouterr()
+
+
+@pytest.mark.parametrize("mtime_snapshot", ["igual", "futuro"])
+def test_snapshot_desatualizado_e_ignorado_qualquer_que_seja_o_mtime(mtime_snapshot, capsys):
+    sistema = Sistema()
+    sistema.produtos = _catalogo()
+    sistema.salvar_produtos()
+    sistema.compactar()
+    sistema.produtos[1].atualizar_estoque(99)
+    sistema.salvar_produtos()
+    # Relógio grosso (mesmo tick) ou relógio que voltou no reboot (snapshot "no futuro")
+    mtime_json = os.stat(Sistema.ARQUIVO_PRODUTOS).st_mtime_ns
+    deslocamento = 0 if mtime_snapshot == "igual" else 3600 * 10**9
+    os.utime(Sistema.ARQUIVO_SNAPSHOT, ns=(mtime_json, mtime_json + deslocamento))
+
+    assert Sistema().produtos[1].estoque == 99
+    capsys.readouterr()
+
+
+def test_compactacao_periodica(capsys):
+    sistema = Sistema()
+    sistema.produtos = _catalogo()
+    for _ in range(Sistema.COMPACTAR_A_CADA - 1):
+        sistema.salvar_produtos()
+    assert not os.path.exists(Sistema.ARQUIVO_SNAPSHOT)
+    sistema.salvar_produtos()
+    assert os.path.exists(Sistema.ARQUIVO_SNAPSHOT)
+    with open(Sistema.ARQUIVO_PRODUTOS, encoding="utf-8") as f:
+        assert json.load(f) == _como_dict(_catalogo())
+    capsys.readouterr()
+
+
+def test_snapshot_guarda_geracao_e_momento_da_gravacao():
+    antes = time.time()
+    salvar_snapshot("data/produtos.snap", _catalogo())
+    salvar_snapshot("data/produtos.snap", _catalogo())
+    atual, anterior = ler_cabecalho("data/produtos.snap"), ler_cabecalho("data/produtos.snap.anterior")
+    assert (anterior["geracao"], atual["geracao"]) == (1, 2)
+    assert antes - 1 <= anterior["gravado_em"] <= atual["gravado_em"] <= time.time() + 1
+    assert atual["total"] == 10
+
+
+def test_recuperacao_prefere_o_snapshot_mais_novo(capsys):
+    sistema = Sistema()
+    sistema.produtos = _catalogo()
+    sistema.salvar_produtos()
+    sistema.compactar()
+    sistema.produtos[0].atualizar_estoque(42)
+    sistema.salvar_produtos()
+    sistema.compactar()
+    # O snapshot atual foi trocado por uma cópia mais antiga (ex.: restauração manual)
+    os.replace(Sistema.ARQUIVO_SNAPSHOT, "mais_novo.snap")
+    os.replace(Sistema.ARQUIVO_SNAPSHOT + ".anterior", Sistema.ARQUIVO_SNAPSHOT)
+    os.replace("mais_novo.snap", Sistema.ARQUIVO_SNAPSHOT + ".anterior")
+    os.remove(Sistema.ARQUIVO_PRODUTOS)
+
+    assert Sistema().produtos[0].estoque == 42
+    saida = capsys.readouterr().out
+    assert "não encontrado" in saida
+    assert "recuperado de data/produtos.snap.anterior" in saida
+
+
+def test_carregar_snapshot_nao_altera_o_coletor(monkeypatch):
+    salvar_snapshot("data/produtos.snap", _catalogo())
+    chamadas = []
+    monkeypatch.setattr(gc, "disable", lambda: chamadas.append("disable"))
+    carregar_snapshot("data/produtos.snap")
+    assert chamadas == []
+
+
+def test_buscar_produto_e_novo_codigo(capsys):
+    sistema = Sistema()
+    sistema.produtos = _catalogo()
+    assert sistema.buscar_produto(3).nome == "Pão de forma nº 3"
+    assert sistema.buscar_produto("4").codigo == 4
+    assert sistema.buscar_produto(999) is None
+    assert sistema.buscar_produto("abc") is None
+    assert sistema._gerar_novo_codigo() == 11
+    capsys.readouterr()
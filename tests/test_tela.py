@@ -0,0 +1,66 @@
+# tests/test_tela.py - Montagem de telas em buffer e spool de impressão
+import io
+
+from models.carrinho import Carrinho
+from models.produto import Produto
+from utils.tela import MENU_PRINCIPAL, SpoolImpressora, Tela, tela_carrinho, tela_produtos
+
+
+class _Destino(io.StringIO):
+    # Conta quantas escritas a tela fez no destino
+    def __init__(self):
+        super().__init__()
+        self.escritas = 0
+
+    def write(self, texto):
+        self.escritas += 1
+        return super().write(texto)
+
+
+def test_tela_emite_uma_unica_escrita():
+    destino = _Destino()
+    produtos = [Produto(1, "Leite", 4.2, 1, 5), Produto(2, "Café", 30, 10, 2)]
+    tela_produtos(produtos).linhas(MENU_PRINCIPAL).emitir(destino)
+    assert destino.escritas == 1
+    assert "[1] Leite - R$ 4.20 (Estoque: 1) [ALERTA: ESTOQUE BAIXO]\n" in destino.getvalue()
+    assert destino.getvalue().endswith("[3] Fechar programa\n")
+
+
+def test_tela_equivale_a_prints(capsys):
+    carrinho = Carrinho()
+    carrinho.adicionar(Produto(7, "Pão", 6.8, 5, 1), 2)
+    print("\n[ CARRINHO ]")
+    print("  - 2x Pão [Cód: 7] (R$ 6.80 cada)")
+    print("  TOTAL BRUTO: R$ 13.60")
+    esperado = capsys.readouterr().out
+    tela_carrinho(carrinho, exibir_codigo=True).emitir()
+    assert capsys.readouterr().out == esperado
+
+
+def test_spool_grava_recibos_em_ordem():
+    spool = SpoolImpressora("spool")
+    for i in range(3):
+        spool.enviar(Tela().linha(f"recibo {i}"))
+    conteudos = []
+    for caminho in spool.pendentes():
+        with open(caminho, encoding="utf-8") as f:
+            conteudos.append(f.read())
+    assert conteudos == ["recibo 0\n", "recibo 1\n", "recibo 2\n"]
+
+
+def test_spool_lista_em_ordem_de_envio_com_prefixos_misturados():
+    spool = SpoolImpressora("spool")
+    enviados = [spool.enviar("venda 1\n"), spool.enviar("fechamento\n", prefixo="fechamento"),
+                spool.enviar("venda 2\n")]
+    assert spool.pendentes() == enviados
+
+
+def test_spool_configurado_por_variavel_de_ambiente(monkeypatch):
+    import main
+
+    monkeypatch.delenv(main.VARIAVEL_SPOOL, raising=False)
+    assert main.impressora_configurada() is None
+    monkeypatch.setenv(main.VARIAVEL_SPOOL, "fila_impressao")
+    impressora = main.impressora_configurada()
+    assert isinstance(impressora, SpoolImpressora)
+    assert impressora.pasta == "fila_impressao"
@@ -1,5 +1,4 @@
 # utils/logging_simple.py - logging simples para registrar eventos/erros
-import datetime
 import os
 
 # Caminho para o arquivo de log
@@ -7,6 +6,8 @@ LOG_FILE = "logs/log.txt"
 
 # Função que escreve uma linha de log com timestamp
 def log(text: str):
+    # Importado aqui: o log só é usado em eventos/erros, não precisa pesar na inicialização
+    import datetime
     # Garante que a pasta exista
     os.makedirs(os.path.dirname(LOG_FILE), exist_ok=True)
     # Abre o arquivo em modo append e escreve a mensagem com timestamp
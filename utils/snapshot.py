@@ -0,0 +1,158 @@
+# utils/snapshot.py - Snapshot binário do catálogo de produtos (carga rápida via mmap)
+# Layout do arquivo (inteiros little-endian):
+#   cabeçalho   MAGIA, versão, registros por bloco, total de registros, total de blocos,
+#               tamanho da tabela de strings, CRC32 da tabela de strings,
+#               origem (tamanho e CRC32 do produtos.json que o snapshot espelha),
+#               geração (contador que cresce a cada gravação), momento da gravação (ns desde a época),
+#               CRC32 do cabeçalho
+#   blocos      CRC32 de cada bloco de registros (um u32 por bloco)
+#   registros   registros de largura fixa: codigo, início e tamanho do nome, preco, estoque, estoque_minimo
+#   strings     nomes concatenados em UTF-8 (início/tamanho contados em caracteres)
+# Qualquer CRC divergente levanta SnapshotCorrompido. A origem permite saber se o snapshot
+# corresponde ao JSON atual sem depender de datas de modificação (relógio/sistema de arquivos);
+# a geração diz qual de dois snapshots é o mais novo.
+import mmap
+import os
+import struct
+import time
+import zlib
+from models.produto import Produto
+
+MAGIA = b"PRDSNAP\x00"
+VERSAO = 3
+REGISTROS_POR_BLOCO = 4096
+
+_CABECALHO = struct.Struct("<8sHIIIQIQIQQ")
+_CRC = struct.Struct("<I")
+_REGISTRO = struct.Struct("<qIIdqq")
+_TAMANHO_CABECALHO = _CABECALHO.size + _CRC.size
+
+
+class SnapshotCorrompido(ValueError):
+    pass
+
+
+# O snapshot está íntegro, mas foi gerado a partir de outra versão do JSON
+class SnapshotDesatualizado(ValueError):
+    pass
+
+
+# Assinatura (tamanho, CRC32) do conteúdo do JSON, gravada como origem do snapshot
+def assinatura(conteudo: bytes) -> tuple[int, int]:
+    return len(conteudo), zlib.crc32(conteudo)
+
+
+# Valida o cabeçalho (CRC, magia e versão) e retorna seus campos
+def _decodificar_cabecalho(dados: bytes, caminho: str) -> tuple:
+    if len(dados) < _TAMANHO_CABECALHO:
+        raise SnapshotCorrompido(f"{caminho}: arquivo truncado.")
+    cabecalho = dados[:_CABECALHO.size]
+    (crc_cabecalho,) = _CRC.unpack_from(dados, _CABECALHO.size)
+    if zlib.crc32(cabecalho) != crc_cabecalho:
+        raise SnapshotCorrompido(f"{caminho}: cabeçalho corrompido.")
+    campos = _CABECALHO.unpack(cabecalho)
+    if campos[0] != MAGIA or campos[1] != VERSAO:
+        raise SnapshotCorrompido(f"{caminho}: formato desconhecido.")
+    return campos
+
+
+# Lê só o cabeçalho do snapshot: {"geracao", "gravado_em" (segundos desde a época), "total"}
+def ler_cabecalho(caminho: str) -> dict:
+    with open(caminho, "rb") as f:
+        campos = _decodificar_cabecalho(f.read(_TAMANHO_CABECALHO), caminho)
+    return {"geracao": campos[9], "gravado_em": campos[10] / 1e9, "total": campos[3]}
+
+
+# Próxima geração: uma a mais que a do snapshot atual ou do anterior (o que for maior)
+def _proxima_geracao(caminho: str) -> int:
+    geracao = 0
+    for existente in (caminho, caminho + ".anterior"):
+        try:
+            geracao = max(geracao, ler_cabecalho(existente)["geracao"])
+        except (SnapshotCorrompido, OSError):
+            pass
+    return geracao + 1
+
+
+# Grava os produtos no snapshot. O arquivo é escrito com nome temporário e renomeado
+# ao final; o snapshot anterior (se houver) é mantido em "<caminho>.anterior".
+# origem: assinatura do JSON com o mesmo conteúdo (None se não houver um JSON correspondente)
+def salvar_snapshot(caminho: str, produtos, origem: tuple[int, int] = None) -> None:
+    nomes = []
+    registros = bytearray()
+    inicio = 0
+    for p in produtos:
+        nome = p.nome
+        nomes.append(nome)
+        registros += _REGISTRO.pack(p.codigo, inicio, len(nome), p.preco, p.estoque, p.estoque_minimo)
+        inicio += len(nome)
+    strings = "".join(nomes).encode("utf-8")
+    total = len(nomes)
+
+    tamanho_bloco = REGISTROS_POR_BLOCO * _REGISTRO.size
+    crcs = [zlib.crc32(registros[i:i + tamanho_bloco]) for i in range(0, len(registros), tamanho_bloco)]
+
+    tamanho_origem, crc_origem = origem if origem is not None else (0, 0)
+    cabecalho = _CABECALHO.pack(MAGIA, VERSAO, REGISTROS_POR_BLOCO, total, len(crcs),
+                                len(strings), zlib.crc32(strings), tamanho_origem, crc_origem,
+                                _proxima_geracao(caminho), time.time_ns())
+    cabecalho += _CRC.pack(zlib.crc32(cabecalho))
+
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    temporario = caminho + ".tmp"
+    with open(temporario, "wb") as f:
+        f.write(cabecalho)
+        f.write(struct.pack(f"<{len(crcs)}I", *crcs))
+        f.write(registros)
+        f.write(strings)
+        f.flush()
+        os.fsync(f.fileno())
+    if os.path.exists(caminho):
+        os.replace(caminho, caminho + ".anterior")
+    os.replace(temporario, caminho)
+
+
+# Carrega os produtos do snapshot, verificando todos os checksums antes de criar os objetos.
+# Com origem informada, levanta SnapshotDesatualizado se o snapshot não espelhar esse JSON.
+# Cria um objeto por produto de uma vez: quem carrega catálogos grandes pode pausar o
+# coletor de lixo em volta da chamada (ver Sistema._carregar_snapshot).
+def carregar_snapshot(caminho: str, origem: tuple[int, int] = None) -> list[Produto]:
+    with open(caminho, "rb") as f:
+        if os.fstat(f.fileno()).st_size < _TAMANHO_CABECALHO:
+            raise SnapshotCorrompido(f"{caminho}: arquivo truncado.")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _ler(mm, caminho, origem)
+
+
+# Valida e decodifica o conteúdo mapeado (fatias do mmap são cópias, então o mapa
+# pode ser fechado com segurança mesmo se uma exceção for levantada no meio)
+def _ler(dados: mmap.mmap, caminho: str, origem: tuple[int, int] = None) -> list[Produto]:
+    try:
+        (_, _, por_bloco, total, blocos, tam_strings, crc_strings,
+         tamanho_origem, crc_origem, _, _) = _decodificar_cabecalho(dados[:_TAMANHO_CABECALHO], caminho)
+        if origem is not None and (tamanho_origem, crc_origem) != tuple(origem):
+            raise SnapshotDesatualizado(f"{caminho}: gerado a partir de outra versão do JSON.")
+
+        inicio_registros = _TAMANHO_CABECALHO + blocos * _CRC.size
+        inicio_strings = inicio_registros + total * _REGISTRO.size
+        if len(dados) != inicio_strings + tam_strings:
+            raise SnapshotCorrompido(f"{caminho}: tamanho inconsistente.")
+
+        crcs = struct.unpack_from(f"<{blocos}I", dados, _TAMANHO_CABECALHO)
+        tamanho_bloco = por_bloco * _REGISTRO.size
+        for i, crc in enumerate(crcs):
+            inicio = inicio_registros + i * tamanho_bloco
+            fim = min(inicio + tamanho_bloco, inicio_strings)
+            if zlib.crc32(dados[inicio:fim]) != crc:
+                raise SnapshotCorrompido(f"{caminho}: bloco {i} corrompido.")
+
+        strings_bytes = dados[inicio_strings:]
+        if zlib.crc32(strings_bytes) != crc_strings:
+            raise SnapshotCorrompido(f"{caminho}: tabela de strings corrompida.")
+        strings = strings_bytes.decode("utf-8")
+
+        registros = _REGISTRO.iter_unpack(dados[inicio_registros:inicio_strings])
+        return [Produto.from_registro(codigo, strings[i:i + n], preco, estoque, minimo)
+                for codigo, i, n, preco, estoque, minimo in registros]
+    except (struct.error, UnicodeDecodeError) as e:
+        raise SnapshotCorrompido(f"{caminho}: {e}") from e
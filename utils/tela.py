@@ -0,0 +1,158 @@
+# utils/tela.py - Monta telas e recibos em um único buffer e os envia de uma vez
+# Cada tela é construída linha a linha em memória e escrita com uma única chamada
+# de write/flush, evitando dezenas de prints em terminais lentos (serial/SSH) e impressoras.
+import os
+import sys
+
+# Modelos fixos das telas (o texto é idêntico ao dos prints originais)
+MENU_PRINCIPAL = (
+    "\n===== SISTEMA DO MERCADO - VERSÃO CORRIGIDA =====",
+    "[1] Gerenciar produtos (adicionar / listar / editar)",
+    "[2] Abrir caixa e iniciar atendimento",
+    "[3] Fechar programa",
+)
+
+MENU_PRODUTOS = (
+    "\n===== GERENCIAR PRODUTOS =====",
+    "[1] Adicionar novo produto",
+    "[2] Listar todos os produtos (e alertas de estoque)",
+    "[3] Editar produto (preço/estoque/minimo)",
+    "[4] Deletar produto",
+    "[5] Voltar ao Menu Principal",
+)
+
+MENU_ATENDIMENTO = (
+    "\n--- ATENDIMENTO ---",
+    "[A] Adicionar produto",
+    "[R] Remover produto do carrinho",
+    "[F] Finalizar compra (Pagamento)",
+    "[C] Cancelar compra e Fechar Caixa",
+)
+
+MENU_PAGAMENTO = (
+    "\n--- FORMAS DE PAGAMENTO ---",
+    "[1] Dinheiro/PIX (10% desconto)",
+    "[2] Débito (5% desconto)",
+    "[3] Crédito 1x (Sem desconto)",
+    "[4] Crédito 2x (+5%)",
+    "[5] Crédito 3x (+10%)",
+    "[6] Crédito 4x (+15%)",
+)
+
+
+class Tela:
+    # Construtor: começa com um buffer vazio de linhas
+    def __init__(self):
+        self._linhas = []
+
+    # Adiciona uma linha ao buffer (equivalente a um print)
+    def linha(self, texto: str = "") -> "Tela":
+        self._linhas.append(texto)
+        return self
+
+    # Adiciona várias linhas (ex.: um dos modelos MENU_*)
+    def linhas(self, textos) -> "Tela":
+        self._linhas.extend(textos)
+        return self
+
+    # Retorna o conteúdo completo da tela como texto
+    def texto(self) -> str:
+        if not self._linhas:
+            return ""
+        return "\n".join(self._linhas) + "\n"
+
+    # Escreve a tela inteira no destino com uma única escrita (padrão: stdout)
+    def emitir(self, destino=None):
+        destino = destino if destino is not None else sys.stdout
+        conteudo = self.texto()
+        if conteudo:
+            destino.write(conteudo)
+            destino.flush()
+        self._linhas = []
+
+
+class SpoolImpressora:
+    # Construtor: define a pasta onde os recibos serão enfileirados para impressão
+    def __init__(self, pasta: str = "spool"):
+        self.pasta = pasta
+        self._sequencia = 0
+
+    # Grava o recibo como um arquivo no spool e retorna o caminho gerado.
+    # O nome começa pelo horário e pela sequência de envio (o prefixo vem depois), então
+    # a ordem alfabética dos arquivos é a ordem de envio, qualquer que seja o prefixo.
+    # O arquivo é escrito com nome temporário e renomeado ao final, para que o
+    # processo de impressão nunca leia um recibo pela metade.
+    def enviar(self, conteudo, prefixo: str = "recibo") -> str:
+        # Importado aqui para não pesar na inicialização do menu (main.py importa este módulo)
+        import datetime
+        if isinstance(conteudo, Tela):
+            conteudo = conteudo.texto()
+        os.makedirs(self.pasta, exist_ok=True)
+        self._sequencia += 1
+        agora = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S_%f")
+        nome_arquivo = os.path.join(self.pasta, f"{agora}_{self._sequencia:06d}_{prefixo}.txt")
+        temporario = nome_arquivo + ".tmp"
+        with open(temporario, "w", encoding="utf-8") as f:
+            f.write(conteudo)
+        os.replace(temporario, nome_arquivo)
+        return nome_arquivo
+
+    # Lista os recibos pendentes no spool em ordem de envio (ver enviar)
+    def pendentes(self) -> list[str]:
+        if not os.path.isdir(self.pasta):
+            return []
+        return sorted(
+            os.path.join(self.pasta, nome)
+            for nome in os.listdir(self.pasta)
+            if nome.endswith(".txt")
+        )
+
+
+# ********************************
+# Modelos dinâmicos (telas que dependem dos dados)
+# ********************************
+
+# Lista de produtos, destacando os que estão com estoque baixo
+def tela_produtos(produtos, tela: Tela = None) -> Tela:
+    tela = tela if tela is not None else Tela()
+    if not produtos:
+        return tela.linha("\nNenhum produto cadastrado.")
+    tela.linha("\n--- LISTA DE PRODUTOS ---")
+    for produto in produtos:
+        alerta = " [ALERTA: ESTOQUE BAIXO]" if produto.estoque_baixo() else ""
+        tela.linha(f"{produto}{alerta}")
+    return tela
+
+
+# Resumo do carrinho (itens e total bruto)
+def tela_carrinho(carrinho, exibir_codigo: bool = False, tela: Tela = None) -> Tela:
+    tela = tela if tela is not None else Tela()
+    tela.linha("\n[ CARRINHO ]")
+    if carrinho.vazio():
+        return tela.linha("Vazio.")
+    for produto, quantidade in carrinho.listar_itens():
+        codigo_str = f" [Cód: {produto.codigo}]" if exibir_codigo else ""
+        tela.linha(f"  - {quantidade}x {produto.nome}{codigo_str} (R$ {produto.preco:.2f} cada)")
+    return tela.linha(f"  TOTAL BRUTO: R$ {carrinho.calcular_total():.2f}")
+
+
+# Recibo da venda exibido ao final da compra
+def recibo_venda(total_bruto: float, pagamento, tela: Tela = None) -> Tela:
+    tela = tela if tela is not None else Tela()
+    return tela.linhas((
+        "\n===== RESUMO DA VENDA =====",
+        f"Total Bruto: R$ {total_bruto:.2f}",
+        f"Forma de Pagamento: {pagamento.descricao}",
+        f"TOTAL A PAGAR: R$ {pagamento.valor_final:.2f}",
+        "===========================",
+    ))
+
+
+# Relatório de fechamento do caixa (mesmo texto no arquivo e no console)
+def recibo_fechamento(total_dia: float, itens_vendidos: int, tela: Tela = None) -> Tela:
+    tela = tela if tela is not None else Tela()
+    return tela.linhas((
+        "===== FECHAMENTO DO CAIXA =====",
+        f"Total arrecadado no dia: R$ {total_dia:.2f}",
+        f"Total de itens vendidos: {itens_vendidos}",
+    ))